@@ -9,35 +9,156 @@ Assume all N words are equally likely as a target.
 
 Q: What is the optimal first guess? That is, what first guess will
    ON AVERAGE leave the fewest possible remaining words to guess?
-A: We need to run O(N^2) iterations of clues_of_guess, and O(N^3)
-   iterations of is_word_possible_after_guess. Each is about
-   O(L) in runtime. Memory requirements are trivial.
+A: The words remaining after a (guess, target) combo are exactly
+   the words which give the same clues as the target. So for each
+   guess we only need N iterations of clues_of_guess, numbering the
+   3^L possible clue patterns and counting how many targets fall in
+   each; the sum of the squares of those counts is the total number
+   of words remaining over all N targets. That's O(N^2) iterations
+   of clues_of_guess overall, each about O(L) in runtime, instead of
+   the O(N^3) iterations of is_word_possible_after_guess we'd need to
+   do it the naive way. Memory requirements are modest: one count for
+   each of the 3^L clue patterns per guess in flight. For long words
+   (more than 10 letters), that table gets too big, so we sort the N
+   patterns of each guess and count the runs of equal patterns instead.
+   (Words of more than 39 letters have too many patterns to number in a
+   64-bit integer at all.)
 
-   Python is too damn slow, can't multithread itself out of a
-   CPU-bound problem due to GIL, and would still be too slow if
-   it could. See the C version instead :-)
+   Python is too damn slow, even for that, so the words are encoded
+   up front as a Structure-of-Arrays: an N*L matrix of letter codes
+   (A=0..Z=25) and an N-vector of letter-presence bitmasks (bit c set
+   if letter c appears in the word). The clues of each guess are then
+   computed against all N targets at once with numpy. If numba is
+   available, we use lexeme.kernels instead, which compiles the whole
+   thing and spreads the guesses over all CPU cores. (Without numba,
+   we can still use the single-core lexeme._kernels, if it was built
+   ahead-of-time with lexeme._kernels_build.) And if CuPy and a
+   CUDA GPU are available, we use lexeme.gpu, which runs one GPU thread
+   for each of the N^2 (guess, target) combos. See the C version for
+   more :-)
 
-usage: best_first_guess.py [wordlist.txt] [target_word_len] > results.csv
+   If we only want the top K guesses, we can do better still: try the
+   most promising guesses first (those whose letters appear in the
+   most words), and give up on each guess as soon as its total is
+   sure to be worse than the K-th best so far. Every remaining target
+   adds at least one word to the total, so this gives exactly the
+   same top K as trying everything.
+
+usage: best_first_guess.py [--top K] [wordlist.txt] [target_word_len] > results.csv
  e.g.: best_first_guess.py /usr/share/dict/american-english 5 > results.csv
+       best_first_guess.py --top 20 /usr/share/dict/american-english 5 > top20.csv
 '''
 
-from lexeme.__main__ import eligible_words
-from lexeme.algorithms import is_word_possible_after_guess, clues_of_guess
+from lexeme.arrays import load_words, encode_words, letter_presence, letter_counts, MAX_PATTERN_LENGTH, DENSE_PATTERN_LENGTH
+import argparse
+import numpy as np
 import sys
+try:
+    from lexeme.gpu import remaining_totals
+except ImportError:
+    try:
+        from lexeme.kernels import remaining_totals
+    except ImportError:
+        try:
+            from lexeme._kernels import remaining_totals
+        except ImportError:
+            remaining_totals = None
+
+
+def compute_patterns(guess_row, letters, counts):
+    '''Clues of one guess against all the encoded targets, each packed into a base-3 integer
+    (digit i is 0=Absent, 1=WrongPosition, 2=RightPosition for position i).'''
+    n, length = letters.shape
+    rp = letters == guess_row
+
+    # Two-pass so that we don't overcount WrongPos: count leftover (non-RP) letters of each target,
+    # only for the letters in the guess, starting from the letter counts shared by all guesses...
+    leftovers = {gl: counts[:, gl] - np.count_nonzero(rp[:, guess_row == gl], axis=1) for gl in set(guess_row)}
+
+    # ... then hand them out as WP left-to-right
+    dtype = np.uint16 if 3 ** length <= 1 << 16 else np.uint32 if 3 ** length <= 1 << 32 else np.uint64
+    patterns = np.zeros(n, dtype=dtype)
+    for ii, gl in enumerate(guess_row):
+        wp = ~rp[:, ii] & (leftovers[gl] > 0)
+        leftovers[gl] -= wp
+        patterns += (2 * rp[:, ii] + wp).astype(dtype) * dtype(3 ** ii)
+    return patterns
 
-if len(sys.argv) == 3:
-    dictfn = sys.argv[1]
-    targetlen = int(sys.argv[2])
-else:
-    raise SystemExit(f"usage: {sys.argv[0]} [wordlist] [wordlen]")
 
-words = list(eligible_words(open(dictfn), targetlen))
+def numpy_remaining_totals(letters, present, weights, guesses, bound, chunk=1024):
+    '''Same as lexeme.kernels.remaining_totals, but using numpy on chunks of the targets.'''
+    n, length = letters.shape
+    counts = letter_counts(letters)
+    total = int(weights.sum())
+    out = np.empty(len(guesses), dtype=np.int64)
+    for ii, gi in enumerate(guesses):
+        if ii % 128 == 0:
+            print(f"Trying {ii}/{len(guesses)}...", end='\r', file=sys.stderr, flush=True)
+        # The words remaining after (guess, target) are exactly those which give the same clues as target, so
+        # summing over all targets gives sum(count**2) over the distinct clue patterns.
+        if length > DENSE_PATTERN_LENGTH:
+            # Too many possible patterns to count in a table, so number only the ones that turn up
+            patterns = np.concatenate([compute_patterns(letters[gi], letters[first:first + chunk], counts[first:first + chunk])
+                                       for first in range(0, n, chunk)])
+            _, inverse = np.unique(patterns, return_inverse=True)
+            out[ii] = int((np.bincount(inverse, weights).astype(np.int64) ** 2).sum())
+            continue
+        pattern_counts = np.zeros(3 ** length, dtype=np.int64)
+        remaining = total
+        for first in range(0, n, chunk):
+            targets = slice(first, first + chunk)
+            pattern_counts += np.bincount(compute_patterns(letters[gi], letters[targets], counts[targets]),
+                                          weights[targets], minlength=3 ** length).astype(np.int64)
+            # Each remaining target will add at least its own weight
+            remaining -= int(weights[targets].sum())
+            acc = int((pattern_counts ** 2).sum())
+            if acc + remaining > bound:
+                break
+        out[ii] = acc + remaining
+    print(file=sys.stderr)
+    return out
+
+
+p = argparse.ArgumentParser(description='Find the first guesses which leave the fewest words on average.')
+p.add_argument('dictfn', metavar='wordlist', help='Wordlist, one word per line')
+p.add_argument('targetlen', metavar='wordlen', type=int, help='Length of target words')
+p.add_argument('--top', metavar='K', type=int,
+               help='Only output the K best guesses (best first), skipping guesses early once they fall behind')
+args = p.parse_args()
+if args.targetlen > MAX_PATTERN_LENGTH:
+    p.error(f'words of more than {MAX_PATTERN_LENGTH} letters have too many clue patterns to count')
+if args.top is not None and args.top < 1:
+    p.error('--top K needs K to be at least 1')
+if remaining_totals is None:
+    remaining_totals = numpy_remaining_totals
+
+words = load_words(args.dictfn, args.targetlen)
+
+# Duplicates (e.g. "AIDS" and "aids" in the same wordlist) give identical results, so we only need to
+# try each distinct word once as a guess, and count it as a target as many times as it appears.
+distinct, inverse, weights = np.unique(words, return_inverse=True, return_counts=True)
+letters = encode_words(distinct, args.targetlen)
+present = letter_presence(letters)
+no_bound = np.iinfo(np.int64).max
 print('guess,avg_words_left_after_first_guess\n')
-for guess in words:
-    print(f"Trying {guess}...", file=sys.stderr)
-    sys.stdout.flush()
-    acc = 0
-    for target in words:
-        clues = clues_of_guess(guess, target)
-        acc += sum(is_word_possible_after_guess(guess, w, clues) for w in words)
-    print(f'"{guess}",{acc / len(words)}')
+if args.top:
+    # Try the guesses whose letters appear in the most words first, so the bound tightens quickly. The
+    # first batch is just K guesses, to get a bound at all; after that, batches big enough to keep all the
+    # cores busy.
+    bits = (present[:, None] >> np.arange(26, dtype=np.uint32)) & 1
+    order = np.argsort(-(bits @ (weights @ bits)), kind='stable')
+    best, bound = [], no_bound
+    first, batch = 0, args.top
+    while first < len(order):
+        print(f"Trying {first}/{len(order)} distinct guesses, best total so far {bound}...", file=sys.stderr)
+        guesses = order[first:first + batch]
+        totals = remaining_totals(letters, present, weights, guesses, bound)
+        best = sorted(best + [(t, gi) for t, gi in zip(totals, guesses) if t <= bound])[:args.top]
+        if len(best) == args.top:
+            bound = best[-1][0]
+        first, batch = first + batch, max(args.top, 1024)
+    sys.stdout.write(''.join(f'"{distinct[gi].decode()}",{t / len(words)}\n' for t, gi in best))
+else:
+    print(f"Trying all {len(distinct)} distinct guesses...", file=sys.stderr)
+    avgs = remaining_totals(letters, present, weights, np.arange(len(distinct)), no_bound) / len(words)
+    sys.stdout.write(''.join(f'"{guess.decode()}",{avg}\n' for guess, avg in zip(words, avgs[inverse])))
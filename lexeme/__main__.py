@@ -10,7 +10,8 @@ try:
 except:
     unidecode = None
 
-from .algorithms import LETTERS, ClueColors, clues_of_guess, update_clues_from_guess, remove_words_using_guess
+from .algorithms import LETTERS, UNKNOWN, CLUE_COLORS, clues_of_guess, clues_function, update_clues_from_guess, \
+    is_eligible_word
 
 
 EMPH = Fore.BLUE + Style.BRIGHT
@@ -18,38 +19,33 @@ RESET = Style.RESET_ALL
 
 
 def colored_letters(clues):
-    result = ''
+    parts = []
     last_stat = None
-    for l in LETTERS:
-        next_stat = clues[l]
+    for l, next_stat in zip(LETTERS, clues):
         if next_stat != last_stat:
-            result += next_stat.value
+            parts.append(CLUE_COLORS[next_stat])
             last_stat = next_stat
-        result += l
-
-    return result + RESET
+        parts.append(l)
+    parts.append(RESET)
+    return ''.join(parts)
 
 
 def colored_guess(guess, target):
-    return ''.join(s.value + l for s, l in zip(clues_of_guess(guess, target), guess)) + RESET
+    return ''.join(CLUE_COLORS[c] + l for c, l in zip(clues_of_guess(guess, target), guess)) + RESET
 
 
 def eligible_words(df, length, strip_diacritics=False):
     if strip_diacritics and not unidecode:
         raise NotImplementedError("unidecode module required for strip_diacritics")
-    for line in df:
-        word = line.strip()
-
+    for word in map(str.strip, df):
         # Need to do this before checking length, because unidecode can change it,
         # as in unidecode('buß') -> 'buss'. I wish unidecode('König') -> 'koenig',
-        # but it doesn't currently do that.
-        if strip_diacritics:
+        # but it doesn't currently do that. (It leaves ASCII alone, though.)
+        if strip_diacritics and not word.isascii():
             word = unidecode(word)
 
-        if len(word) == length:
-            # No non-letter characters, or mixed case (latter are likely proper nouns)
-            if all(c.upper() in LETTERS for c in word) and word in (word.upper(), word.lower()):
-                yield word.upper()
+        if is_eligible_word(word, length):
+            yield word.upper()
 
 
 def parse_args(args=None):
@@ -80,23 +76,44 @@ def main(args=None):
     p, args = parse_args(args)
 
     words = list(eligible_words(args.dict, args.length, args.strip_diacritics))
-    narrow_words = words
+    words_set = frozenset(words)
+    if args.analyzer:
+        # Only the analyzer needs numpy (and numba, if available), so don't make every game wait to import them.
+        # Prefer the AOT-compiled kernel, which doesn't have to wait for numba either.
+        import numpy as np
+        from .arrays import encode_words, letter_presence, letter_counts, pack_words, words_possible_after_guess
+        try:
+            from ._kernels import filter_mask
+        except ImportError:
+            try:
+                from .kernels import filter_mask
+            except ImportError:
+                filter_mask = None
+
+        # Possible words as fixed-width bytes, so they can be narrowed down with the same masks as the arrays
+        narrow_words = np.array([w.encode('ascii') for w in words], dtype=f'S{args.length}')
+        # ... along with just the arrays that filter_mask or words_possible_after_guess needs
+        narrow_arrays = (encode_words(narrow_words, args.length),)
+        if not filter_mask:
+            narrow_arrays = (pack_words(narrow_arrays[0]), letter_presence(narrow_arrays[0]), letter_counts(narrow_arrays[0]))
 
     if args.test:
         target = args.test.strip().upper()
-        if target not in words:
+        if target not in words_set:
             p.error(f"Need a known {args.length}-letter word to test, not {target!r}")
         print(f"I've chosen the word {target} which you specified to test with!")
     else:
         target = random.choice(words)
         print(f"I've chosen a {EMPH}{args.length}{RESET}-letter word from {EMPH}{len(words)}{RESET} possibilities.")
+    target_b = target.encode('ascii')
+    clues_of = clues_function(args.length)
     print(f"You have {EMPH}{args.guesses}{RESET} guesses to guess it correctly.")
     if not args.nonsense:
         print(f"All your guesses must be words that I know!")
     print()
 
     guesses = []
-    letter_clues = {l: ClueColors.Unknown for l in LETTERS}
+    letter_clues = bytearray([UNKNOWN]) * len(LETTERS)
     start_at = last_at = time.time()
     while len(guesses) < args.guesses:
         # Ask for next guess
@@ -104,14 +121,14 @@ def main(args=None):
         if args.analyzer == 1 or (args.analyzer == 2 and len(narrow_words) >= 100):
             print(f"There are {EMPH}{len(narrow_words)}{RESET} possible words remaining.")
         elif args.analyzer >= 2:
-            print(f"There are {EMPH}{len(narrow_words)}{RESET} possible words remaining: {', '.join(narrow_words)}")
+            print(f"There are {EMPH}{len(narrow_words)}{RESET} possible words remaining: {b', '.join(narrow_words).decode()}")
 
         try:
             while True:
                 guess = input("Your guess? ").strip().upper()
-                if len(guess) != args.length or any(c not in LETTERS for c in guess):
+                if len(guess) != args.length or not (guess.isascii() and guess.isalpha()):
                     print(f"Must be a word consisting of exactly {EMPH}{args.length}{RESET} letters. Try again.")
-                elif not args.nonsense and guess not in words:
+                elif not args.nonsense and guess not in words_set:
                     print(f"Hmmm, I don't know the word {EMPH}{guess}{RESET}. Try again.")
                 else:
                     break  # Okay
@@ -121,7 +138,8 @@ def main(args=None):
             break
 
         # Update clues with guess
-        update_clues_from_guess(letter_clues, guess, target)
+        guess_b = guess.encode('ascii')
+        update_clues_from_guess(letter_clues, guess_b, target_b)
         guesses.append(guess)
 
         now = time.time()
@@ -143,7 +161,15 @@ def main(args=None):
 
         # Narrow possible words from guess
         if args.analyzer:
-            narrow_words = list(remove_words_using_guess(guess, target, narrow_words))
+            clues = clues_of(guess_b, target_b)
+            guess_row = encode_words([guess_b], args.length)[0]
+            if filter_mask:
+                possible = np.empty(len(narrow_words), dtype=bool)
+                filter_mask(*narrow_arrays, guess_row, np.frombuffer(clues, dtype=np.uint8), possible)
+            else:
+                possible = words_possible_after_guess(guess_row, clues, *narrow_arrays)
+            narrow_words = narrow_words[possible]
+            narrow_arrays = tuple(a[possible] for a in narrow_arrays)
 
     if guesses and guesses[-1] == target:
         print(f"Correct! {colored_guess(target, target)}")
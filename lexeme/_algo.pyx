@@ -0,0 +1,57 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+'''
+Cython versions of the hottest functions in lexeme.algorithms
+'''
+
+from cpython.bytes cimport PyBytes_FromStringAndSize, PyBytes_AS_STRING
+
+cdef enum:
+    MAX_PATTERN_LENGTH = 39  # Patterns of longer words overflow a long long
+
+
+cdef int _clues(bytes guess, bytes target, Py_ssize_t length, char *clues) except -1:
+    cdef int leftovers[26]
+    cdef Py_ssize_t ii
+    cdef const unsigned char *g = guess
+    cdef const unsigned char *t = target
+    cdef unsigned char gl, tl
+
+    # Two-pass so that we don't overcount WrongPos.
+    for ii in range(26):
+        leftovers[ii] = 0
+    for ii in range(length):
+        gl = g[ii]
+        tl = t[ii]
+        if not (c'A' <= gl <= c'Z' and c'A' <= tl <= c'Z'):
+            raise ValueError(f"Non-letter in guess {guess!r} or target {target!r}")
+        if gl == tl:
+            clues[ii] = 2  # RightPosition
+        else:
+            clues[ii] = 0  # Absent
+            leftovers[tl - 65] += 1
+    for ii in range(length):
+        gl = g[ii]
+        if clues[ii] == 0 and leftovers[gl - 65] > 0:
+            leftovers[gl - 65] -= 1
+            clues[ii] = 1  # WrongPosition
+    return 0
+
+
+def clue_codes(bytes guess not None, bytes target not None):
+    cdef Py_ssize_t length = min(len(guess), len(target))
+    result = PyBytes_FromStringAndSize(NULL, length)
+    _clues(guess, target, length, PyBytes_AS_STRING(result))
+    return result
+
+
+def pattern_of_guess(bytes guess not None, bytes target not None):
+    cdef Py_ssize_t length = min(len(guess), len(target)), ii
+    cdef char clues[MAX_PATTERN_LENGTH]
+    cdef long long pattern = 0
+
+    if length > MAX_PATTERN_LENGTH:
+        raise ValueError(f"Can't pack clues of more than {MAX_PATTERN_LENGTH} letters")
+    _clues(guess, target, length, clues)
+    for ii in range(length - 1, -1, -1):
+        pattern = 3 * pattern + clues[ii]
+    return pattern
@@ -0,0 +1,27 @@
+'''
+Ahead-of-time compilation of lexeme.kernels into the lexeme._kernels extension
+module, which doesn't need numba (or any compilation) when it's imported.
+
+Run with: python -m lexeme._kernels_build (or python setup.py build_ext, which
+builds it along with everything else when numba is installed)
+
+numba.pycc can't compile parallel code, so the AOT remaining_totals runs on one
+core; with numba installed, the JIT-compiled and cached lexeme.kernels is
+still faster on multi-core machines for large wordlists.
+'''
+
+import os
+
+from numba.pycc import CC
+
+from lexeme import kernels
+
+cc = CC('_kernels')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+cc.export('pattern_of_guess', 'i8(u1[:], u1[:])')(kernels.pattern_of_guess.py_func)
+cc.export('filter_mask', 'void(u1[:, :], u1[:], u1[:], b1[:])')(kernels.filter_mask.py_func)
+cc.export('remaining_totals', 'i8[:](u1[:, :], u4[:], i8[:], i8[:], i8)')(kernels.remaining_totals.py_func)
+
+if __name__ == '__main__':
+    cc.compile()
@@ -1,4 +1,5 @@
 from enum import Enum
+from functools import lru_cache
 from colorama import Back, Style
 
 
@@ -12,76 +13,186 @@ ClueColors = Enum('ClueColors', {
     'RightPosition': Back.GREEN,
 })
 
+# Integer codes for the clues (the first three are also the digits of pattern_of_guess),
+# and the colors to show them with, indexed by code.
+ABSENT, WRONGPOS, RIGHTPOS, UNKNOWN = range(4)
+_clues_by_code = (ClueColors.Absent, ClueColors.WrongPosition, ClueColors.RightPosition, ClueColors.Unknown)
+CLUE_COLORS = tuple(c.value for c in _clues_by_code)
 
-def clues_of_guess(guess, target):
-    clues = []
-    leftovers = []
 
-    # Two-pass so that we don't overcount WrongPos.
+def is_eligible_word(word, length):
+    # Right length, and no non-letter characters, or mixed case (latter are likely proper nouns).
+    # Works the same on str or ASCII bytes.
+    return len(word) == length and word.isascii() and word.isalpha() and (word.isupper() or word.islower())
+
+
+# The clue_codes, pattern_of_guess, and remove_words_using_guess kernels take words as ASCII
+# bytes, rather than str, so that each letter is just a small int.
+
+def _clue_codes(guess, target):
+    clues = bytearray(min(len(guess), len(target)))  # All Absent
+    leftovers = [0] * 26
+
+    # Two-pass so that we don't overcount WrongPos: count the leftover (non-RP) letters of the target...
     # https://twitter.com/moxfyre/status/1477321560927129604
     for gl, tl in zip(guess, target):
-        if gl == tl:
-            clues.append(ClueColors.RightPosition)
-        else:
-            clues.append(ClueColors.Absent)
-            leftovers.append(tl)
+        if gl != tl:
+            leftovers[tl - 65] += 1
+    # ... then hand them out as WP, left-to-right
     for ii, (gl, tl) in enumerate(zip(guess, target)):
         if gl == tl:
-            pass  # Don't change
-        elif gl in leftovers:
-            leftovers.remove(gl)
-            clues[ii] = ClueColors.WrongPosition
+            clues[ii] = 2  # RightPosition
+        else:
+            k = gl - 65
+            if leftovers[k]:
+                leftovers[k] -= 1
+                clues[ii] = 1  # WrongPosition
+
+    return bytes(clues)
 
-    return clues
+
+def _pattern_of_guess(guess, target):
+    # Same as _clue_codes, but packed into a base-3 integer (digit i is the code for position i)
+    # so that the clues of different targets can be compared and counted cheaply.
+    pattern = 0
+    leftovers = [0] * 26
+
+    for gl, tl in zip(guess, target):
+        if gl != tl:
+            leftovers[tl - 65] += 1
+    digit = 1
+    for gl, tl in zip(guess, target):
+        if gl == tl:
+            pattern += 2 * digit  # RightPosition
+        else:
+            k = gl - 65
+            if leftovers[k]:
+                leftovers[k] -= 1
+                pattern += digit  # WrongPosition
+        digit *= 3
+
+    return pattern
+
+
+@lru_cache()
+def _unrolled_pattern_of_guess(length):
+    # Same as _pattern_of_guess, but generated with the loops unrolled for words of exactly
+    # this length, so there's no zip/enumerate/unpacking overhead for each letter.
+    src = ['def pattern_of_guess(guess, target):',
+           '    pattern = 0',
+           '    leftovers = [0] * 26']
+    for ii in range(length):
+        src += [f'    if guess[{ii}] != target[{ii}]:',
+                f'        leftovers[target[{ii}] - 65] += 1']
+    for ii in range(length):
+        src += [f'    if guess[{ii}] == target[{ii}]:',
+                f'        pattern += {2 * 3 ** ii}',
+                f'    elif leftovers[guess[{ii}] - 65]:',
+                f'        leftovers[guess[{ii}] - 65] -= 1',
+                f'        pattern += {3 ** ii}']
+    src.append('    return pattern')
+
+    ns = {}
+    exec('\n'.join(src), ns)
+    return ns['pattern_of_guess']
+
+
+@lru_cache()
+def _unrolled_clue_codes(length):
+    # Same as _clue_codes, but generated with the loops unrolled for words of exactly this
+    # length, like _unrolled_pattern_of_guess.
+    src = ['def clue_codes(guess, target):',
+           f'    clues = bytearray({length})',
+           '    leftovers = [0] * 26']
+    for ii in range(length):
+        src += [f'    if guess[{ii}] == target[{ii}]:',
+                f'        clues[{ii}] = 2',
+                '    else:',
+                f'        leftovers[target[{ii}] - 65] += 1']
+    for ii in range(length):
+        src += [f'    if not clues[{ii}] and leftovers[guess[{ii}] - 65]:',
+                f'        leftovers[guess[{ii}] - 65] -= 1',
+                f'        clues[{ii}] = 1']
+    src.append('    return bytes(clues)')
+
+    ns = {}
+    exec('\n'.join(src), ns)
+    return ns['clue_codes']
+
+
+try:
+    from ._algo import clue_codes, pattern_of_guess
+except ImportError:
+    clue_codes = _clue_codes
+    pattern_of_guess = _pattern_of_guess
+
+
+def pattern_function(length):
+    # Fastest available version of pattern_of_guess for words of exactly this length
+    return _unrolled_pattern_of_guess(length) if pattern_of_guess is _pattern_of_guess else pattern_of_guess
+
+
+def clues_function(length):
+    # Fastest available version of clue_codes for words of exactly this length
+    return _unrolled_clue_codes(length) if clue_codes is _clue_codes else clue_codes
+
+
+@lru_cache(maxsize=8192)
+def clues_of_guess(guess, target):
+    # Clue codes as bytes; CLUE_COLORS[code] (or _clues_by_code[code]) for display.
+    # Cached, since the same guesses are shown (and their clues computed) again after every turn.
+    return clue_codes(guess.encode('ascii'), target.encode('ascii'))
 
 
 def update_clues_from_guess(clues, guess, target):
+    # clues is a bytearray of codes indexed by letter code (A=0..Z=25)
     for gl, tl in zip(guess, target):
         if gl == tl:
-            clues[gl] = ClueColors.RightPosition
+            clues[gl - 65] = RIGHTPOS
         elif gl in target:
-            if clues[gl] in (ClueColors.Unknown, ClueColors.Absent):
-                clues[gl] = ClueColors.WrongPosition
+            if clues[gl - 65] != RIGHTPOS:  # Don't downgrade RP (and WP -> WP is a no-op)
+                clues[gl - 65] = WRONGPOS
         else:
-            clues[gl] = ClueColors.Absent
+            clues[gl - 65] = ABSENT
 
 
 def is_word_possible_after_guess(guess, word, clues):
-    wp_guess = {}
-    a_guess = {}
-    left_word = {}
+    # Letter counts indexed by letter code (A=0..Z=25), rather than dicts keyed by letter
+    wp_guess = bytearray(26)
+    left_word = bytearray(26)
 
-    for ii, (gl, wl, s) in enumerate(zip(guess, word, clues)):
-        # print(gl, wl, s)
-        if (gl == wl) and (s != ClueColors.RightPosition):
+    for gl, wl, s in zip(guess, word, clues):
+        if (gl == wl) and (s != RIGHTPOS):
             return False  # Guess and word share a letter which is NOT marked as RP in the guess
-        elif (gl != wl) and (s == ClueColors.RightPosition):
+        elif (gl != wl) and (s == RIGHTPOS):
             return False  # Guess and word differ in a letter which IS marked as RP in the guess
-        else:
-            # Count number of leftover (non-RP) letters in the word
-            if s != ClueColors.RightPosition:
-                left_word[wl] = left_word.get(wl, 0) + 1
-
-            # Count number of A/WP letters in the guess
-            if s == ClueColors.WrongPosition:
-                wp_guess[gl] = wp_guess.get(gl, 0) + 1
-            elif s == ClueColors.Absent:
-                a_guess[gl] = a_guess.get(gl, 0) + 1
-
-    # Make sure there are enough of the WP letters from the guess in the word
-    for l, n in wp_guess.items():
-        if left_word.get(l, 0) < n:
+        elif s != RIGHTPOS:
+            # Count number of leftover (non-RP) letters in the word, and of WP letters in the guess
+            left_word[wl - 65] += 1
+            if s == WRONGPOS:
+                wp_guess[gl - 65] += 1
+
+    for gl, s in zip(guess, clues):
+        k = gl - 65
+        if s == WRONGPOS and left_word[k] < wp_guess[k]:
             return False  # Guess has more of these letters as WP than the word does
-
-    # Make sure there aren't any of the A letters from the guess in the word, after discounting
-    # the WP letters from the guess.
-    for l, n in a_guess.items():
-        if left_word.get(l, 0) > wp_guess.get(l, 0):
-            return False  # Guess has this letter as A, and word still has some left
+        elif s == ABSENT and left_word[k] > wp_guess[k]:
+            # After discounting the WP letters from the guess, word still has some of this A letter left
+            return False
 
     return True  # It's (still) a possible match
 
 
 def remove_words_using_guess(guess, target, words):
-    clues = clues_of_guess(guess, target)
-    return (word for word in words if is_word_possible_after_guess(guess, word, clues))
+    # A word is still possible if and only if it would have given the same clues as the target
+    # (equivalent to is_word_possible_after_guess, but much cheaper)
+    pattern_of = pattern_function(len(guess))
+    pattern = pattern_of(guess, target)
+
+    # Most words can be ruled out more cheaply still by set operations on their letters: they must have
+    # all the RP/WP letters of the guess, and none of the A letters (unless the guess also has them as RP/WP).
+    clues = clues_function(len(guess))(guess, target)
+    must_have = {gl for gl, c in zip(guess, clues) if c != ABSENT}
+    must_not = {gl for gl, c in zip(guess, clues) if c == ABSENT} - must_have
+    return (word for word in words
+            if must_not.isdisjoint(word) and must_have.issubset(word) and pattern_of(guess, word) == pattern)
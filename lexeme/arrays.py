@@ -0,0 +1,96 @@
+'''
+numpy versions of lexeme.algorithms, working on whole wordlists at once.
+
+Words (as ASCII bytes) are encoded as rows of a uint8 matrix of letter
+codes (A=0..Z=25).
+From that we derive a uint32 letter-presence bitmask for each word (bit
+c set if letter c appears in the word), and a row of 26 letter counts
+for each word, so that they only need to be computed once per wordlist.
+For comparing all the positions of a word at once, the letter codes are
+also packed 5 bits apiece into uint64s (PACKED_LETTERS per uint64).
+'''
+
+import numpy as np
+
+from .algorithms import is_eligible_word
+
+PACKED_LETTERS = 12
+
+# Clue patterns (as from lexeme.algorithms.pattern_of_guess) of words up to MAX_PATTERN_LENGTH letters
+# fit in an int64. Up to DENSE_PATTERN_LENGTH letters, they can be counted in a table of all 3**length
+# possible patterns; for longer words, that table gets too big, and they have to be counted by sorting.
+MAX_PATTERN_LENGTH = 39
+DENSE_PATTERN_LENGTH = 10
+
+
+def load_words(path, length):
+    '''Same as lexeme.__main__.eligible_words (without strip_diacritics), but reads the whole wordlist
+    at once, and returns the words as ASCII bytes, ready for encode_words.'''
+    with open(path, 'rb') as df:
+        lines = df.read().split(b'\n')
+    return [word.upper() for word in map(bytes.strip, lines) if is_eligible_word(word, length)]
+
+
+def encode_words(words, length):
+    return np.frombuffer(b''.join(words), dtype=np.uint8).reshape(-1, length) - ord('A')
+
+
+def letter_presence(letters):
+    present = np.zeros(len(letters), dtype=np.uint32)
+    for ii in range(letters.shape[1]):
+        present |= np.uint32(1) << letters[:, ii].astype(np.uint32)
+    return present
+
+
+def letter_counts(letters):
+    counts = np.zeros((len(letters), 26), dtype=np.uint8)
+    rows = np.arange(len(letters))
+    for ii in range(letters.shape[1]):
+        counts[rows, letters[:, ii]] += 1
+    return counts
+
+
+def pack_words(letters):
+    n, length = letters.shape
+    packed = np.zeros((n, -(-length // PACKED_LETTERS)), dtype=np.uint64)
+    for ii in range(length):
+        packed[:, ii // PACKED_LETTERS] |= letters[:, ii].astype(np.uint64) << np.uint64(5 * (ii % PACKED_LETTERS))
+    return packed
+
+
+def words_possible_after_guess(guess_row, clues, packed, present, counts):
+    '''Vectorized is_word_possible_after_guess, taking the clues as from clue_codes, and
+    returning a boolean mask over all the encoded words.'''
+    clues = np.frombuffer(clues, dtype=np.uint8)
+    rp = clues == 2
+
+    # Most words can be ruled out just by which letters they contain: all the RP/WP letters
+    # of the guess, and none of the A letters (unless the guess also has them as RP/WP).
+    bits = np.uint32(1) << guess_row.astype(np.uint32)
+    required = np.bitwise_or.reduce(bits[clues != 0], initial=np.uint32(0))
+    forbidden = np.bitwise_or.reduce(bits[clues == 0], initial=np.uint32(0)) & ~required
+    possible = ((present & required) == required) & ((present & forbidden) == 0)
+
+    # Word must share exactly the RP letters with the guess. Adding 0b01111 to the low 4 bits of each
+    # 5-bit field of (word ^ guess) carries into the field's high bit if and only if the field is nonzero.
+    x = packed ^ pack_words(guess_row[None, :])
+    low, high, rp_high = pack_words(np.array([np.full(len(rp), 15), np.full(len(rp), 16), 16 * rp], dtype=np.uint8))
+    same = ~(((x & low) + low) | x) & high
+    possible &= (same == rp_high).all(axis=1)
+
+    candidates = np.flatnonzero(possible)
+    counts = counts[candidates]
+    ok = np.ones(len(candidates), dtype=bool)
+
+    # Word must have at least as many of each letter as the guess has RP+WP, and exactly
+    # that many if the guess also has it as A. (The presence test already covered 0 and 1.)
+    for gl in np.unique(guess_row):
+        n = np.count_nonzero(guess_row[clues != 0] == gl)
+        if np.count_nonzero(guess_row[clues == 0] == gl):
+            if n:
+                ok &= counts[:, gl] == n
+        elif n > 1:
+            ok &= counts[:, gl] >= n
+
+    possible[candidates] = ok
+    return possible
@@ -0,0 +1,122 @@
+'''
+CuPy (CUDA) version of lexeme.kernels.remaining_totals, for when there's a GPU handy.
+
+Words are encoded as in lexeme.arrays.
+'''
+
+import numpy as np
+import cupy as cp
+
+from .arrays import MAX_PATTERN_LENGTH, DENSE_PATTERN_LENGTH
+
+if not cp.cuda.is_available():
+    raise ImportError("No CUDA device available")
+
+# One thread per (guess, target) combo, each computing the clue pattern as in
+# lexeme.kernels.pattern_of_guess, and either counting it for that guess (for short
+# words) or just writing it out to be counted by sorting (for long words).
+_module = cp.RawModule(code=r'''
+__device__ long long pattern_of_guess(const unsigned char *letters, const unsigned int *present,
+                                      int length, long long gi, long long ti)
+{
+    long long pattern = 0;
+
+    if (present[gi] & present[ti]) {
+        const unsigned char *g = letters + gi * length, *t = letters + ti * length;
+        unsigned char leftovers[26] = {0};
+        for (int ii = 0; ii < length; ii++)
+            if (g[ii] != t[ii])
+                leftovers[t[ii]]++;
+        long long digit = 1;
+        for (int ii = 0; ii < length; ii++, digit *= 3) {
+            if (g[ii] == t[ii])
+                pattern += 2 * digit;
+            else if (leftovers[g[ii]]) {
+                leftovers[g[ii]]--;
+                pattern += digit;
+            }
+        }
+    } /* else no letters in common, so all Absent */
+    return pattern;
+}
+
+extern "C" __global__
+void count_patterns(const unsigned char *letters, const unsigned int *present, const long long *weights,
+                    long long n, int length, const long long *guesses, long long n_guesses, long long n_patterns,
+                    unsigned long long *counts)
+{
+    long long idx = (long long)blockIdx.x * blockDim.x + threadIdx.x;
+    if (idx >= n_guesses * n)
+        return;
+    long long ti = idx % n;
+    long long pattern = pattern_of_guess(letters, present, length, guesses[idx / n], ti);
+    atomicAdd(&counts[(idx / n) * n_patterns + pattern], (unsigned long long)weights[ti]);
+}
+
+extern "C" __global__
+void write_patterns(const unsigned char *letters, const unsigned int *present,
+                    long long n, int length, const long long *guesses, long long n_guesses,
+                    long long *patterns)
+{
+    long long idx = (long long)blockIdx.x * blockDim.x + threadIdx.x;
+    if (idx >= n_guesses * n)
+        return;
+    patterns[idx] = pattern_of_guess(letters, present, length, guesses[idx / n], idx % n);
+}
+''')
+_count_patterns = _module.get_function('count_patterns')
+_write_patterns = _module.get_function('write_patterns')
+
+
+def _sorted_totals(patterns, weights):
+    # Totals (as in remaining_totals) for each row of patterns, counting them by sorting each row
+    n_guesses, n = patterns.shape
+    order = cp.argsort(patterns, axis=1)
+    patterns = cp.take_along_axis(patterns, order, axis=1)
+    # A run of equal patterns ends wherever the next one differs, and at the end of each row...
+    ends = cp.ones((n_guesses, n), dtype=cp.bool_)
+    ends[:, :-1] = patterns[:, 1:] != patterns[:, :-1]
+    ends = cp.flatnonzero(ends)
+    # ... so the weighted count of each run is a difference of the cumulative weights at the run ends...
+    runs = cp.diff(cp.cumsum(weights[order].ravel())[ends], prepend=0)
+    # ... and the total for each row is a difference of the cumulative squares at the row ends.
+    row_ends = cp.cumsum(runs ** 2)[ends % n == n - 1]
+    return cp.diff(row_ends, prepend=0)
+
+
+def remaining_totals(letters, present, weights, guesses, bound, max_counts=1 << 25):
+    '''For each of the guesses (indices into letters), the total number of words remaining over all the words
+    as targets, with each target counted as many times as its weight. Divide by weights.sum() for the average.
+
+    Unlike lexeme.kernels.remaining_totals, this never gives up early on a guess, so bound is ignored.'''
+    n, length = letters.shape
+    if length > MAX_PATTERN_LENGTH:
+        raise ValueError("Words are too long to pack their clue patterns into 64-bit integers")
+    letters_d = cp.ascontiguousarray(cp.asarray(letters, dtype=cp.uint8))
+    present_d = cp.asarray(present, dtype=cp.uint32)
+    weights_d = cp.asarray(weights, dtype=cp.int64)
+    guesses_d = cp.asarray(guesses, dtype=cp.int64)
+
+    # Do the guesses in chunks, so that the counts (or the patterns, for long words) don't take up too much
+    # GPU memory
+    out = np.empty(len(guesses), dtype=np.int64)
+    dense = length <= DENSE_PATTERN_LENGTH
+    n_patterns = 3 ** length if dense else n
+    chunk = max(1, max_counts // n_patterns)
+    for first in range(0, len(guesses), chunk):
+        n_guesses = min(chunk, len(guesses) - first)
+        threads = n_guesses * n
+        if dense:
+            counts = cp.zeros((n_guesses, n_patterns), dtype=cp.uint64)
+            _count_patterns(((threads + 255) // 256,), (256,),
+                            (letters_d, present_d, weights_d, cp.int64(n), cp.int32(length),
+                             guesses_d[first:], cp.int64(n_guesses), cp.int64(n_patterns), counts))
+            totals = (counts.astype(cp.int64) ** 2).sum(axis=1)
+        else:
+            patterns = cp.empty((n_guesses, n), dtype=cp.int64)
+            _write_patterns(((threads + 255) // 256,), (256,),
+                            (letters_d, present_d, cp.int64(n), cp.int32(length),
+                             guesses_d[first:], cp.int64(n_guesses), patterns))
+            totals = _sorted_totals(patterns, weights_d)
+        out[first:first + n_guesses] = cp.asnumpy(totals)
+    return out
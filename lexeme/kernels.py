@@ -0,0 +1,105 @@
+'''
+Numba-compiled kernels for working on whole wordlists at once.
+
+Words are encoded as in lexeme.arrays.
+'''
+
+import numpy as np
+from numba import njit, prange
+
+from .arrays import MAX_PATTERN_LENGTH, DENSE_PATTERN_LENGTH
+
+
+@njit(cache=True)
+def pattern_of_guess(guess, target):
+    # Clues packed into a base-3 integer (digit i is 0=Absent, 1=WrongPosition, 2=RightPosition
+    # for position i). Two-pass so that we don't overcount WrongPos.
+    leftovers = np.zeros(26, dtype=np.uint8)
+    for ii in range(len(guess)):
+        if guess[ii] != target[ii]:
+            leftovers[target[ii]] += 1
+    pattern = 0
+    digit = 1
+    for ii in range(len(guess)):
+        if guess[ii] == target[ii]:
+            pattern += 2 * digit
+        elif leftovers[guess[ii]]:
+            leftovers[guess[ii]] -= 1
+            pattern += digit
+        digit *= 3
+    return pattern
+
+
+@njit(parallel=True, cache=True)
+def filter_mask(letters, guess, clues, out):
+    '''Set out[i] to whether word i is still possible after guess got clues (codes as from lexeme.algorithms.clue_codes).
+    That's exactly when word i would give the same clues as the target did.'''
+    pattern = 0
+    digit = 1
+    for c in clues:
+        pattern += c * digit
+        digit *= 3
+    for ii in prange(len(letters)):
+        out[ii] = pattern_of_guess(guess, letters[ii]) == pattern
+
+
+@njit(cache=True)
+def _counted_total(letters, present, weights, gi, bound):
+    # Total for one guess (as in remaining_totals), counting the patterns in a table of all of them
+    n, length = letters.shape
+    counts = np.zeros(3 ** length, dtype=np.int64)
+    acc = 0
+    remaining = weights.sum()
+    for ti in range(n):
+        if present[gi] & present[ti]:
+            p = pattern_of_guess(letters[gi], letters[ti])
+        else:
+            p = 0  # No letters in common, so all Absent
+        # The total is sum(count**2) over the patterns, so adding w to a count adds (2*count + w)*w...
+        w = weights[ti]
+        acc += (2 * counts[p] + w) * w
+        counts[p] += w
+        # ... and each remaining target will add at least its own weight.
+        remaining -= w
+        if acc + remaining > bound:
+            break
+    return acc + remaining
+
+
+@njit(cache=True)
+def _sorted_total(letters, present, weights, gi):
+    # Total for one guess (as in remaining_totals), counting the patterns by sorting them
+    n = len(letters)
+    patterns = np.zeros(n, dtype=np.int64)  # No letters in common means all Absent
+    for ti in range(n):
+        if present[gi] & present[ti]:
+            patterns[ti] = pattern_of_guess(letters[gi], letters[ti])
+    order = np.argsort(patterns)
+    acc = 0
+    count = 0
+    for jj in range(n):
+        count += weights[order[jj]]
+        if jj == n - 1 or patterns[order[jj + 1]] != patterns[order[jj]]:
+            acc += count * count
+            count = 0
+    return acc
+
+
+@njit(parallel=True, cache=True)
+def remaining_totals(letters, present, weights, guesses, bound):
+    '''For each of the guesses (indices into letters), the total number of words remaining over all the words
+    as targets, with each target counted as many times as its weight. Divide by weights.sum() for the average.
+
+    As soon as the total for a guess is sure to be more than bound, we give up on it and return some number
+    that is more than bound instead. (Only for words of up to DENSE_PATTERN_LENGTH letters; for longer
+    words, the totals are always exact.)'''
+    length = letters.shape[1]
+    if length > MAX_PATTERN_LENGTH:
+        raise ValueError("Words are too long to pack their clue patterns into 64-bit integers")
+    out = np.empty(len(guesses), dtype=np.int64)
+    for ii in prange(len(guesses)):
+        if length > DENSE_PATTERN_LENGTH:
+            out[ii] = _sorted_total(letters, present, weights, guesses[ii])
+        else:
+            out[ii] = _counted_total(letters, present, weights, guesses[ii], bound)
+    return out
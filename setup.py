@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 
+import os
 import sys
 
 try:
@@ -7,8 +8,32 @@ try:
 except ImportError:
     from distutils.core import setup
 
-if sys.version_info[0] < 3:
-    sys.exit("Python 3.x is required; you are using %s" % sys.version)
+try:
+    from Cython.Build import cythonize
+except ImportError:
+    ext_modules = []  # Fall back to pure-Python lexeme.algorithms
+else:
+    ext_modules = cythonize('lexeme/_algo.pyx')
+
+# pip's PEP 517 builds don't put the source tree on sys.path, so lexeme._kernels_build can't be found
+# without this. (And pip's default isolated build environment doesn't have numba, so lexeme._kernels
+# only gets built with pip install --no-build-isolation, or setup.py build_ext.)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+try:
+    from lexeme._kernels_build import cc
+except (ImportError, RuntimeError) as e:
+    # No numba (or no C compiler for numba.pycc to use), so no AOT-compiled lexeme._kernels
+    print(f"Not building lexeme._kernels: {e}", file=sys.stderr)
+else:
+    ext_modules.append(cc.distutils_extension())
+
+# The extensions are all optional speedups, so if one fails to build (e.g. no C compiler), just install
+# without it.
+for ext in ext_modules:
+    ext.optional = True
+
+if sys.version_info < (3, 7):
+    sys.exit("Python 3.7+ is required; you are using %s" % sys.version)
 
 setup(
     name="lexeme",
@@ -20,9 +45,11 @@ setup(
     author_email="dlenski@gmail.com",
     license='GPL v3 or later',
     url="https://github.com/dlenski/lexeme",
+    python_requires='>=3.7',
     install_requires=open('requirements.txt').readlines(),
-    extras_require={'unidecode': ['unidecode']},
+    extras_require={'unidecode': ['unidecode'], 'numba': ['numba']},
     packages=["lexeme"],
+    ext_modules=ext_modules,
     entry_points={'console_scripts': ['lexeme=lexeme.__main__:main']},
     tests_require=open('requirements-test.txt').readlines(),
     test_suite='nose2.collector.collector',
@@ -1,15 +1,15 @@
-from lexeme.algorithms import LETTERS, ClueColors, clues_of_guess, update_clues_from_guess, remove_words_using_guess
+from unittest import SkipTest
 
-_clues_abbrev = {
-    ClueColors.Unknown: 'U',
-    ClueColors.Absent: 'A',
-    ClueColors.WrongPosition: 'W',
-    ClueColors.RightPosition: 'R',
-}
+from lexeme import algorithms
+from lexeme.algorithms import LETTERS, UNKNOWN, clues_of_guess, update_clues_from_guess, remove_words_using_guess
+
+from .words import WORDS5, WORDS6
+
+_clues_abbrev = 'AWRU'  # Indexed by clue code
 
 
 def _check_clues_array(actual, expected):
-    actual = ''.join(a.name[0] for a in actual)
+    actual = ''.join(_clues_abbrev[c] for c in actual)
     assert expected == actual
 
 
@@ -18,7 +18,8 @@ def _check_clues_of_guess(guess, target, expected_clues):
 
 
 def _check_clues_of_letters(letter_clues, which_letters, expected_clues):
-    return _check_clues_array([letter_clues[l] for l in which_letters], expected_clues)
+    actual = ''.join(_clues_abbrev[letter_clues[LETTERS.index(l)]] for l in which_letters)
+    assert expected_clues == actual
 
 
 def test_guess_clues():
@@ -40,29 +41,28 @@ def test_guess_clues():
 
 
 def test_update_clues_from_guess():
-    clues = {l: ClueColors.Unknown for l in LETTERS}
+    clues = bytearray([UNKNOWN]) * len(LETTERS)
 
     # First we guess SWEAT and verify clues are correct
-    update_clues_from_guess(clues, 'SWEAT', 'FLEAS')
+    update_clues_from_guess(clues, b'SWEAT', b'FLEAS')
     _check_clues_of_letters(clues, 'SWEAT', 'WARRA')
 
     # Next we guess FLAKS, which moves 'A', 'E' from RP->WP and removes 'S' (WP) altogether, and
     # verify that those letters keep their best previous status.
-    update_clues_from_guess(clues, 'FLAKS', 'FLEAS')
+    update_clues_from_guess(clues, b'FLAKS', b'FLEAS')
     _check_clues_of_letters(clues, 'FLKSAE', 'RRARRR')
 
 
 def test_remove_words_using_guess():
-    words = {'ADDUCE', 'ADVICE', 'ADVISE', 'DEDUCE', 'DELVES', 'DEVILS', 'DEVICE', 'DEVISE', 'ELVISH', 'EVENER', 'EVOLVE',
-             'LEAVES', 'LOAVES', 'REVEAL', 'REVELS', 'REVILE', 'REVISE', 'REVIVE', 'SEVENS', 'VESSEL', 'VIOLAS', 'VIOLIN'}
+    words = set(WORDS6)
 
     # Specific cases
     _check_clues_of_guess('VXXXXX', 'ADDUCE', 'AAAAAA')
-    assert {'ADDUCE', 'DEDUCE'} == set(remove_words_using_guess('VXXXXX', 'ADDUCE', words))            # 'AAAAAA'
+    assert {b'ADDUCE', b'DEDUCE'} == set(remove_words_using_guess(b'VXXXXX', b'ADDUCE', words))            # b'AAAAAA'
     _check_clues_of_guess('XXXXXV', 'VIOLAS', 'AAAAAW')
-    assert {'VESSEL', 'VIOLAS', 'VIOLIN'} == set(remove_words_using_guess('VXXXXX', 'VIOLAS', words))  # 'AAAAAW'
+    assert {b'VESSEL', b'VIOLAS', b'VIOLIN'} == set(remove_words_using_guess(b'VXXXXX', b'VIOLAS', words))  # b'AAAAAW'
     _check_clues_of_guess('ADVICE', 'EVENER', 'AAWAAW')
-    assert {'EVENER', 'VESSEL'} == set(remove_words_using_guess('ADVICE', 'EVENER', words))            # 'AAWAAW'
+    assert {b'EVENER', b'VESSEL'} == set(remove_words_using_guess(b'ADVICE', b'EVENER', words))            # b'AAWAAW'
 
     # Exhaustive
     for target in words:
@@ -74,4 +74,30 @@ def test_remove_words_using_guess():
         assert {target} == set(remove_words_using_guess(target, target, words))
 
         # A guess with no overlapping letters should eliminate nothing
-        assert words == set(remove_words_using_guess('XXXXXX', target, words))
+        assert words == set(remove_words_using_guess(b'XXXXXX', target, words))
+
+
+def test_is_word_possible_after_guess():
+    for guess in WORDS5:
+        for target in WORDS5:
+            clues = algorithms.clue_codes(guess, target)
+            expected = set(remove_words_using_guess(guess, target, WORDS5))
+            assert expected == {w for w in WORDS5 if algorithms.is_word_possible_after_guess(guess, w, clues)}
+
+
+def test_pattern_of_guess():
+    for guess in WORDS5:
+        for target in WORDS5:
+            codes = algorithms._clue_codes(guess, target)
+            assert codes == algorithms._unrolled_clue_codes(5)(guess, target)
+            assert sum(c * 3 ** ii for ii, c in enumerate(codes)) == algorithms._pattern_of_guess(guess, target)
+            assert algorithms._pattern_of_guess(guess, target) == algorithms._unrolled_pattern_of_guess(5)(guess, target)
+
+
+def test_algo_extension():
+    if algorithms.clue_codes is algorithms._clue_codes:
+        raise SkipTest('lexeme._algo extension not built')
+    for guess in WORDS5:
+        for target in WORDS5:
+            assert algorithms._clue_codes(guess, target) == algorithms.clue_codes(guess, target)
+            assert algorithms._pattern_of_guess(guess, target) == algorithms.pattern_of_guess(guess, target)
@@ -0,0 +1,37 @@
+from lexeme.algorithms import clue_codes, remove_words_using_guess
+from lexeme.arrays import encode_words, letter_presence, letter_counts, pack_words, words_possible_after_guess
+
+from .words import WORDS6 as _words
+
+
+def test_encode_words():
+    letters = encode_words([b'ABCZZY', b'VIOLIN'], 6)
+    assert [[0, 1, 2, 25, 25, 24], [21, 8, 14, 11, 8, 13]] == letters.tolist()
+    assert [(1 << 0) | (1 << 1) | (1 << 2) | (1 << 24) | (1 << 25),
+            (1 << 21) | (1 << 8) | (1 << 14) | (1 << 11) | (1 << 13)] == letter_presence(letters).tolist()
+    counts = letter_counts(letters)
+    assert (2, 1, 1) == (counts[0, 25], counts[0, 24], counts[0, 0])
+    assert (2, 0) == (counts[1, 8], counts[1, 25])
+    assert [[0 | 1 << 5 | 2 << 10 | 25 << 15 | 25 << 20 | 24 << 25],
+            [21 | 8 << 5 | 14 << 10 | 11 << 15 | 8 << 20 | 13 << 25]] == pack_words(letters).tolist()
+
+
+def test_words_possible_after_guess():
+    letters = encode_words(_words, 6)
+    packed, present, counts = pack_words(letters), letter_presence(letters), letter_counts(letters)
+    for guess in _words + [b'XXXXXX', b'VXXXXX', b'EEEEEE']:
+        for target in _words:
+            possible = words_possible_after_guess(encode_words([guess], 6)[0], clue_codes(guess, target),
+                                                  packed, present, counts)
+            assert list(remove_words_using_guess(guess, target, _words)) == [w for w, p in zip(_words, possible) if p]
+
+    # Long words need more than one uint64 each
+    words = [w * 3 for w in _words]
+    letters = encode_words(words, 18)
+    packed, present, counts = pack_words(letters), letter_presence(letters), letter_counts(letters)
+    assert packed.shape == (len(words), 2)
+    for guess in words[:5]:
+        for target in words:
+            possible = words_possible_after_guess(encode_words([guess], 18)[0], clue_codes(guess, target),
+                                                  packed, present, counts)
+            assert list(remove_words_using_guess(guess, target, words)) == [w for w, p in zip(words, possible) if p]
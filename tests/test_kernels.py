@@ -0,0 +1,123 @@
+from unittest import SkipTest
+
+from lexeme.algorithms import clue_codes, clues_of_guess, remove_words_using_guess
+try:
+    import numpy as np
+    from lexeme import kernels
+except ImportError:
+    kernels = None
+try:
+    from lexeme import _kernels
+except ImportError:
+    _kernels = None
+try:
+    from lexeme import gpu
+except ImportError:
+    gpu = None
+
+from .words import WORDS6
+
+_words = [w.decode('ascii') for w in WORDS6]
+
+
+def _encode(word):
+    return np.frombuffer(word.encode('ascii'), dtype=np.uint8) - ord('A')
+
+
+def _present(word):
+    return np.uint32(sum(1 << (ord(c) - ord('A')) for c in set(word)))
+
+
+def test_pattern_of_guess():
+    if not kernels:
+        raise SkipTest('numba not available')
+    for guess in _words + ['XXXXXX', 'AAHEDS']:
+        for target in _words:
+            expected = sum(c * 3 ** ii for ii, c in enumerate(clues_of_guess(guess, target)))
+            assert expected == kernels.pattern_of_guess(_encode(guess), _encode(target))
+
+
+def test_filter_mask():
+    if not kernels:
+        raise SkipTest('numba not available')
+    letters = np.array([_encode(w) for w in _words])
+    words = [w.encode('ascii') for w in _words]
+    out = np.empty(len(words), dtype=bool)
+    for guess in _words + ['XXXXXX', 'AAHEDS']:
+        for target in words:
+            clues = np.frombuffer(clues_of_guess(guess, target.decode()), dtype=np.uint8)
+            kernels.filter_mask(letters, _encode(guess), clues, out)
+            assert list(remove_words_using_guess(guess.encode('ascii'), target, words)) == [w for w, o in zip(words, out) if o]
+
+
+def test_remaining_totals():
+    if not kernels:
+        raise SkipTest('numba not available')
+    letters = np.array([_encode(w) for w in _words])
+    present = np.array([_present(w) for w in _words])
+    words = [w.encode('ascii') for w in _words]
+    guesses = np.arange(len(words))
+    no_bound = np.iinfo(np.int64).max
+    expected = [sum(len(list(remove_words_using_guess(guess, target, words))) for target in words) for guess in words]
+    totals = kernels.remaining_totals(letters, present, np.ones(len(words), dtype=np.int64), guesses, no_bound)
+    assert expected == list(totals)
+
+    # Weights should count the same as duplicate targets
+    weights = np.arange(1, len(words) + 1)
+    targets = [w for w, n in zip(words, weights) for _ in range(n)]
+    expected = [sum(len(list(remove_words_using_guess(guess, target, targets))) for target in targets) for guess in words]
+    assert expected == list(kernels.remaining_totals(letters, present, weights, guesses, no_bound))
+
+    # With a bound, guesses within it should be exact, and the others should be over it
+    bound = sorted(expected)[5]
+    for e, t in zip(expected, kernels.remaining_totals(letters, present, weights, guesses, bound)):
+        assert e == t if e <= bound else t > bound
+
+    # Long words have too many clue patterns to count in a table, so they get counted by sorting instead
+    words = [w * 4 for w in words]
+    letters = np.array([_encode(w.decode()) for w in words])
+    targets = [w for w, n in zip(words, weights) for _ in range(n)]
+    expected = [sum(len(list(remove_words_using_guess(guess, target, targets))) for target in targets) for guess in words]
+    assert expected == list(kernels.remaining_totals(letters, present, weights, guesses, no_bound))
+    try:
+        kernels.remaining_totals(np.zeros((1, 40), dtype=np.uint8), present[:1], weights[:1], guesses[:1], no_bound)
+    except ValueError:
+        pass
+    else:
+        assert False, 'should not be able to pack clue patterns of 40-letter words'
+
+
+def test_aot_kernels():
+    if not (kernels and _kernels):
+        raise SkipTest('numba not available, or lexeme._kernels not built')
+    letters = np.array([_encode(w) for w in _words])
+    present = np.array([_present(w) for w in _words])
+    weights = np.arange(1, len(_words) + 1)
+    for guess, gw in zip(letters, _words):
+        for target, tw in zip(letters, _words):
+            assert kernels.pattern_of_guess(guess, target) == _kernels.pattern_of_guess(guess, target)
+            clues = np.frombuffer(clue_codes(gw.encode('ascii'), tw.encode('ascii')), dtype=np.uint8)
+            expected, out = np.empty(len(letters), dtype=bool), np.empty(len(letters), dtype=bool)
+            kernels.filter_mask(letters, guess, clues, expected)
+            _kernels.filter_mask(letters, guess, clues, out)
+            assert (expected == out).all()
+    guesses = np.arange(len(_words))
+    for bound in (np.iinfo(np.int64).max, 5000):
+        expected = kernels.remaining_totals(letters, present, weights, guesses, bound)
+        assert (expected == _kernels.remaining_totals(letters, present, weights, guesses, bound)).all()
+
+
+def test_gpu_remaining_totals():
+    if not (kernels and gpu):
+        raise SkipTest('numba or CuPy not available, or no CUDA device')
+    weights = np.arange(1, len(_words) + 1)
+    guesses = np.arange(len(_words))
+    no_bound = np.iinfo(np.int64).max
+    # Short words get their clue patterns counted in a table, and long words get them counted by sorting
+    for words in (_words, [w * 4 for w in _words]):
+        letters = np.array([_encode(w) for w in words])
+        present = np.array([_present(w) for w in words])
+        expected = kernels.remaining_totals(letters, present, weights, guesses, no_bound)
+        assert (expected == gpu.remaining_totals(letters, present, weights, guesses, no_bound)).all()
+        # Also in many chunks of guesses
+        assert (expected == gpu.remaining_totals(letters, present, weights, guesses, no_bound, max_counts=1)).all()
@@ -1,6 +1,8 @@
 import os
+from tempfile import NamedTemporaryFile
 
 from lexeme.__main__ import eligible_words
+from lexeme.arrays import load_words
 
 _dd = '/usr/share/dict/words'
 _ds = '/usr/share/dict/spanish'
@@ -28,3 +30,18 @@ def test_spanish_dict_has_accented_words():
         ):
             assert word in eligible_words(df, length, strip_diacritics=True)
             df.seek(0)
+
+
+_lines = ['hello\n', 'WORLD\r\n', 'Hello\n', 'héllo\n', 'ab-cd\n', 'abcd1\n', 'ıiiii\n', 'toolong\n', 'four\n']
+
+
+def test_eligible_words_rejects_nonletters_and_mixed_case():
+    assert ['HELLO', 'WORLD'] == list(eligible_words(_lines, 5))
+
+
+def test_load_words():
+    with NamedTemporaryFile('w', encoding='utf-8') as tf:
+        assert [] == load_words(tf.name, 5)
+        tf.writelines(_lines)
+        tf.flush()
+        assert [b'HELLO', b'WORLD'] == load_words(tf.name, 5)
@@ -0,0 +1,8 @@
+# Word lists shared by the tests, as ASCII bytes
+
+# Five-letter words with lots of repeated letters, for checking that WrongPosition isn't overcounted
+WORDS5 = [b'SWEAT', b'FLEAS', b'REELS', b'REBUS', b'ROARS', b'BEARS', b'ARIAS', b'PAPAS', b'ALAMO', b'AAHED', b'ABEAM', b'XXXXX']
+
+# Six-letter words with lots of letters in common, so that most guesses leave several of them possible
+WORDS6 = [b'ADDUCE', b'ADVICE', b'ADVISE', b'DEDUCE', b'DELVES', b'DEVILS', b'DEVICE', b'DEVISE', b'ELVISH', b'EVENER', b'EVOLVE',
+          b'LEAVES', b'LOAVES', b'REVEAL', b'REVELS', b'REVILE', b'REVISE', b'REVIVE', b'SEVENS', b'VESSEL', b'VIOLAS', b'VIOLIN']